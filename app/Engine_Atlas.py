@@ -1,7 +1,15 @@
+import math
+
 import streamlit as st
 
 from components.engine_dna import EngineDNA, render_engine_dna
-from utils import apply_css, apply_filters, get_wikipedia_image_url, load_data
+from utils import (
+    apply_css,
+    apply_filters,
+    get_filter_options,
+    get_wikipedia_image_url,
+    load_data,
+)
 
 st.set_page_config(page_title="Engine Atlas", layout="wide")
 apply_css()
@@ -13,13 +21,9 @@ st.caption("Data-driven analysis of car engine performance, efficiency, and evol
 
 with st.sidebar:
     st.header("Filters")
-    make_options = sorted(df["make"].dropna().unique().tolist())
-    engine_options = sorted(df["engine_type"].dropna().unique().tolist())
-    cylinder_options = (
-        df["number_of_cylinders"].dropna().sort_values().unique().astype(int).tolist()
+    make_options, engine_options, cylinder_options, min_year, max_year = (
+        get_filter_options()
     )
-    min_year = int(df["year"].min())
-    max_year = int(df["year"].max())
 
     selected_makes = st.multiselect("Brand", make_options)
     selected_engine = st.multiselect("Engine type", engine_options)
@@ -30,7 +34,7 @@ filtered = apply_filters(df, selected_makes, selected_years, selected_engine, se
 
 def mean_or_na(series, fmt: str) -> str:
     value = series.mean()
-    if value != value:
+    if math.isnan(value):
         return "N/A"
     return fmt.format(value)
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import html
+import math
 from dataclasses import dataclass
 
 
@@ -45,7 +46,7 @@ def render_engine_dna(dna: EngineDNA) -> str:
 
 
 def format_value(value: float | None, suffix: str = "") -> str:
-    if value is None or value != value:
+    if value is None or math.isnan(value):
         return "N/A"
     if suffix:
         return f"{value:.1f} {suffix}"
@@ -54,14 +55,14 @@ def format_value(value: float | None, suffix: str = "") -> str:
 
 def svg_engine_layout(layout: str, cylinders: int | float | None) -> str:
     layout = (layout or "inline").lower()
-    count = int(cylinders) if cylinders and cylinders == cylinders else 4
+    count = int(cylinders) if cylinders and not math.isnan(cylinders) else 4
     count = max(2, min(count, 12))
 
     if "v" in layout:
-        return _svg_v_engine(count)
+        return SVG_CACHE[("v", count)]
     if "boxer" in layout or "flat" in layout:
-        return _svg_boxer_engine(count)
-    return _svg_inline_engine(count)
+        return SVG_CACHE[("boxer", count)]
+    return SVG_CACHE[("inline", count)]
 
 
 def _svg_inline_engine(count: int) -> str:
@@ -114,3 +115,14 @@ def _svg_boxer_engine(count: int) -> str:
       {right}
     </svg>
     """
+
+
+SVG_CACHE: dict[tuple[str, int], str] = {
+    (layout, count): builder(count)
+    for layout, builder in (
+        ("inline", _svg_inline_engine),
+        ("v", _svg_v_engine),
+        ("boxer", _svg_boxer_engine),
+    )
+    for count in range(2, 13)
+}
@@ -1,74 +1,113 @@
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 import streamlit as st
 
-from utils import apply_css, apply_filters, load_data
+from utils import (
+    FilterKey,
+    apply_css,
+    apply_filter_key,
+    box_stats,
+    get_filter_options,
+    make_filter_key,
+)
 
 st.title("Brand Battles")
 apply_css()
 
-df = load_data()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def brand_figures_json(filter_key: FilterKey) -> tuple[str, str, str]:
+    filtered = apply_filter_key(filter_key)
+
+    hp_by_make = (
+        filtered.dropna(subset=["make", "engine_hp"])
+        .groupby("make", as_index=False, observed=True)["engine_hp"]
+        .median()
+        .sort_values("engine_hp", ascending=False)
+        .head(20)
+    )
+    fig_hp = px.bar(
+        hp_by_make,
+        x="engine_hp",
+        y="make",
+        orientation="h",
+        title="Top 20 Brands by Median Horsepower",
+    )
+
+    fuel_by_make = (
+        filtered.dropna(subset=["make", "mixed_fuel_consumption_per_100_km_l"])
+        .groupby("make", as_index=False, observed=True)["mixed_fuel_consumption_per_100_km_l"]
+        .median()
+        .sort_values("mixed_fuel_consumption_per_100_km_l", ascending=True)
+        .head(20)
+    )
+    fig_fuel = px.bar(
+        fuel_by_make,
+        x="mixed_fuel_consumption_per_100_km_l",
+        y="make",
+        orientation="h",
+        title="Top 20 Brands by Efficiency (Lower is Better)",
+    )
+
+    with_hp = filtered.dropna(subset=["make", "engine_hp"])
+    counts = with_hp["make"].value_counts()
+    big_makes = counts.index[counts >= 50]
+    sampled = with_hp[with_hp["make"].isin(big_makes)]
+    # Quartiles are computed here so the browser gets one box per brand plus
+    # the outlier points, instead of every row.
+    stats, outliers = box_stats(sampled, "make", "engine_hp")
+    fig_box = go.Figure(
+        [
+            go.Box(
+                x=stats["make"],
+                q1=stats["q1"],
+                median=stats["median"],
+                q3=stats["q3"],
+                lowerfence=stats["lowerfence"],
+                upperfence=stats["upperfence"],
+                name="engine_hp",
+                boxpoints=False,
+                marker_color=px.colors.qualitative.Plotly[0],
+            ),
+            go.Scatter(
+                x=outliers["make"],
+                y=outliers["engine_hp"],
+                mode="markers",
+                name="outliers",
+                marker=dict(color=px.colors.qualitative.Plotly[0], size=4),
+            ),
+        ]
+    )
+    fig_box.update_layout(
+        title="Horsepower Distribution (Brands with 50+ rows)",
+        xaxis_title="make",
+        yaxis_title="engine_hp",
+        xaxis_tickangle=45,
+        showlegend=False,
+    )
+
+    return fig_hp.to_json(), fig_fuel.to_json(), fig_box.to_json()
+
 
 with st.sidebar:
     st.header("Filters")
-    make_options = sorted(df["make"].dropna().unique().tolist())
-    engine_options = sorted(df["engine_type"].dropna().unique().tolist())
-    cylinder_options = (
-        df["number_of_cylinders"].dropna().sort_values().unique().astype(int).tolist()
+    make_options, engine_options, cylinder_options, min_year, max_year = (
+        get_filter_options()
     )
-    min_year = int(df["year"].min())
-    max_year = int(df["year"].max())
     selected_makes = st.multiselect("Brand", make_options)
     selected_engine = st.multiselect("Engine type", engine_options)
     selected_cyl = st.multiselect("Cylinders", cylinder_options)
     selected_years = st.slider("Year range", min_year, max_year, (min_year, max_year))
 
-filtered = apply_filters(df, selected_makes, selected_years, selected_engine, selected_cyl)
+filter_key = make_filter_key(selected_makes, selected_years, selected_engine, selected_cyl)
+hp_json, fuel_json, box_json = brand_figures_json(filter_key)
 
 st.subheader("Median Horsepower by Brand")
-hp_by_make = (
-    filtered.dropna(subset=["make", "engine_hp"])
-    .groupby("make", as_index=False)["engine_hp"]
-    .median()
-    .sort_values("engine_hp", ascending=False)
-    .head(20)
-)
-fig_hp = px.bar(
-    hp_by_make,
-    x="engine_hp",
-    y="make",
-    orientation="h",
-    title="Top 20 Brands by Median Horsepower",
-)
-st.plotly_chart(fig_hp, width='stretch')
+st.plotly_chart(pio.from_json(hp_json), width='stretch')
 
 st.subheader("Median Fuel Consumption by Brand")
-fuel_by_make = (
-    filtered.dropna(subset=["make", "mixed_fuel_consumption_per_100_km_l"])
-    .groupby("make", as_index=False)["mixed_fuel_consumption_per_100_km_l"]
-    .median()
-    .sort_values("mixed_fuel_consumption_per_100_km_l", ascending=True)
-    .head(20)
-)
-fig_fuel = px.bar(
-    fuel_by_make,
-    x="mixed_fuel_consumption_per_100_km_l",
-    y="make",
-    orientation="h",
-    title="Top 20 Brands by Efficiency (Lower is Better)",
-)
-st.plotly_chart(fig_fuel, width='stretch')
+st.plotly_chart(pio.from_json(fuel_json), width='stretch')
 
 st.subheader("Horsepower Distribution by Brand")
-sampled = (
-    filtered.dropna(subset=["make", "engine_hp"])
-    .groupby("make")
-    .filter(lambda g: len(g) >= 50)
-)
-fig_box = px.box(
-    sampled,
-    x="make",
-    y="engine_hp",
-    title="Horsepower Distribution (Brands with 50+ rows)",
-)
-fig_box.update_layout(xaxis_tickangle=45)
-st.plotly_chart(fig_box, width='stretch')
+st.plotly_chart(pio.from_json(box_json), width='stretch')
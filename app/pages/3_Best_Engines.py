@@ -1,7 +1,13 @@
 import plotly.express as px
 import streamlit as st
 
-from utils import apply_css, apply_filters, load_data
+from utils import (
+    apply_css,
+    apply_filters,
+    get_filter_options,
+    load_data,
+    top_n_rows,
+)
 
 st.title("Best Engines")
 apply_css()
@@ -10,13 +16,9 @@ df = load_data()
 
 with st.sidebar:
     st.header("Filters")
-    make_options = sorted(df["make"].dropna().unique().tolist())
-    engine_options = sorted(df["engine_type"].dropna().unique().tolist())
-    cylinder_options = (
-        df["number_of_cylinders"].dropna().sort_values().unique().astype(int).tolist()
+    make_options, engine_options, cylinder_options, min_year, max_year = (
+        get_filter_options()
     )
-    min_year = int(df["year"].min())
-    max_year = int(df["year"].max())
     selected_makes = st.multiselect("Brand", make_options)
     selected_engine = st.multiselect("Engine type", engine_options)
     selected_cyl = st.multiselect("Cylinders", cylinder_options)
@@ -28,10 +30,7 @@ col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Fastest 0–100 km/h")
-    fastest = (
-        filtered.dropna(subset=["acceleration_0_100_km_h_s"])
-        .nsmallest(15, "acceleration_0_100_km_h_s")
-    )
+    fastest = top_n_rows(filtered, "acceleration_0_100_km_h_s", largest=False)
     fig_fast = px.bar(
         fastest,
         x="acceleration_0_100_km_h_s",
@@ -43,7 +42,7 @@ with col1:
 
 with col2:
     st.subheader("Most Powerful")
-    powerful = filtered.dropna(subset=["engine_hp"]).nlargest(15, "engine_hp")
+    powerful = top_n_rows(filtered, "engine_hp")
     fig_power = px.bar(
         powerful,
         x="engine_hp",
@@ -57,9 +56,8 @@ col3, col4 = st.columns(2)
 
 with col3:
     st.subheader("Most Efficient")
-    efficient = (
-        filtered.dropna(subset=["mixed_fuel_consumption_per_100_km_l"])
-        .nsmallest(15, "mixed_fuel_consumption_per_100_km_l")
+    efficient = top_n_rows(
+        filtered, "mixed_fuel_consumption_per_100_km_l", largest=False
     )
     fig_eff = px.bar(
         efficient,
@@ -72,7 +70,7 @@ with col3:
 
 with col4:
     st.subheader("Best Power Density")
-    density = filtered.dropna(subset=["hp_per_liter"]).nlargest(15, "hp_per_liter")
+    density = top_n_rows(filtered, "hp_per_liter")
     fig_density = px.bar(
         density,
         x="hp_per_liter",
@@ -83,7 +81,7 @@ with col4:
     st.plotly_chart(fig_density, width='stretch')
 
 st.subheader("Balanced Score Leaderboard")
-balanced = filtered.dropna(subset=["balanced_score"]).nlargest(15, "balanced_score")
+balanced = top_n_rows(filtered, "balanced_score")
 fig_bal = px.bar(
     balanced,
     x="balanced_score",
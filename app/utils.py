@@ -3,8 +3,16 @@
 from __future__ import annotations
 
 from pathlib import Path
+import dbm
+import os
+import pickle
+import shelve
 import sys
 import json
+import tempfile
+import threading
+import time
+from typing import NamedTuple
 import urllib.parse
 import urllib.request
 
@@ -12,7 +20,7 @@ import numpy as np
 import pandas as pd
 import plotly.express as px
 import streamlit as st
-from sklearn.cluster import KMeans
+from sklearn.cluster import MiniBatchKMeans
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
 
@@ -21,11 +29,20 @@ SRC = ROOT / "src"
 if str(SRC) not in sys.path:
     sys.path.append(str(SRC))
 
+from engine_atlas import data_processing
 from engine_atlas.data_processing import clean_engine_data
 
 
 DATA_PATH = ROOT / "data" / "Car Dataset 1945-2020.csv"
+CACHE_DIR = ROOT / "data" / "processed"
 WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+WIKI_CACHE_PATH = ROOT / ".wiki_cache"
+WIKI_MISS_TTL = 86400
+MAX_PLOT_POINTS = 5000
+
+_WIKI_CACHE_LOCK = threading.Lock()
+# dbm.error is itself a tuple of exception classes, so it has to be unpacked here.
+_WIKI_CACHE_ERRORS = (OSError, *dbm.error, pickle.UnpicklingError, EOFError)
 
 
 def apply_css() -> None:
@@ -33,9 +50,66 @@ def apply_css() -> None:
     st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
 
 
+def _cache_path() -> Path:
+    # Keyed by the CSV and the cleaning code so either change rebuilds the cache.
+    csv_key = DATA_PATH.stat().st_mtime_ns
+    code_key = Path(data_processing.__file__).stat().st_mtime_ns
+    return CACHE_DIR / f"clean_{csv_key}_{code_key}.parquet"
+
+
 @st.cache_data(show_spinner=False)
 def load_data() -> pd.DataFrame:
-    return clean_engine_data(str(DATA_PATH))
+    path = _cache_path()
+    if path.exists():
+        try:
+            return pd.read_parquet(path)
+        except (OSError, ValueError):
+            pass
+
+    df = clean_engine_data(str(DATA_PATH))
+    _write_cache(df, path)
+    return df
+
+
+def _write_cache(df: pd.DataFrame, path: Path) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so concurrent workers never read a partial file.
+        fd, tmp_name = tempfile.mkstemp(dir=CACHE_DIR, suffix=".parquet.tmp")
+        os.close(fd)
+    except OSError:
+        return
+    try:
+        df.to_parquet(tmp_name, compression="zstd")
+        os.replace(tmp_name, path)
+    except (OSError, ValueError, TypeError, ImportError):
+        Path(tmp_name).unlink(missing_ok=True)
+        return
+    for stale in CACHE_DIR.glob("clean_*.parquet"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+class FilterOptions(NamedTuple):
+    makes: list[str]
+    engine_types: list[str]
+    cylinders: list[int]
+    year_min: int
+    year_max: int
+
+
+@st.cache_data(show_spinner=False)
+def get_filter_options() -> FilterOptions:
+    df = load_data()
+    return FilterOptions(
+        makes=sorted(df["make"].dropna().unique().tolist()),
+        engine_types=sorted(df["engine_type"].dropna().unique().tolist()),
+        cylinders=(
+            df["number_of_cylinders"].dropna().sort_values().unique().astype(int).tolist()
+        ),
+        year_min=int(df["year"].min()),
+        year_max=int(df["year"].max()),
+    )
 
 
 def apply_filters(
@@ -45,45 +119,84 @@ def apply_filters(
     engine_types: list[str],
     cylinders: list[int],
 ) -> pd.DataFrame:
-    filtered = df.copy()
+    mask = np.ones(len(df), dtype=bool)
     if makes:
-        filtered = filtered[filtered["make"].isin(makes)]
+        mask &= df["make"].isin(makes).to_numpy()
     if engine_types:
-        filtered = filtered[filtered["engine_type"].isin(engine_types)]
+        mask &= df["engine_type"].isin(engine_types).to_numpy()
     if cylinders:
-        filtered = filtered[filtered["number_of_cylinders"].isin(cylinders)]
-    if "year" in filtered.columns:
-        filtered = filtered[
-            (filtered["year"] >= years[0]) & (filtered["year"] <= years[1])
-        ]
-    return filtered
+        mask &= df["number_of_cylinders"].isin(cylinders).to_numpy()
+    if "year" in df.columns:
+        year = df["year"].to_numpy()
+        mask &= (year >= years[0]) & (year <= years[1])
+    return df.loc[mask]
 
 
-def compute_clusters(df: pd.DataFrame, k: int = 4) -> pd.DataFrame:
-    features = [
-        "engine_hp",
-        "acceleration_0_100_km_h_s",
-        "mixed_fuel_consumption_per_100_km_l",
-        "number_of_cylinders",
-    ]
-    subset = df[features].dropna()
+FilterKey = tuple[tuple[str, ...], tuple[int, int], tuple[str, ...], tuple[int, ...]]
+
+
+def make_filter_key(
+    makes: list[str],
+    years: tuple[int, int],
+    engine_types: list[str],
+    cylinders: list[int],
+) -> FilterKey:
+    return tuple(makes), tuple(years), tuple(engine_types), tuple(cylinders)
+
+
+def apply_filter_key(filter_key: FilterKey) -> pd.DataFrame:
+    makes, years, engine_types, cylinders = filter_key
+    return apply_filters(
+        load_data(), list(makes), years, list(engine_types), list(cylinders)
+    )
+
+
+CLUSTER_FEATURES = [
+    "engine_hp",
+    "acceleration_0_100_km_h_s",
+    "mixed_fuel_consumption_per_100_km_l",
+    "number_of_cylinders",
+]
+
+
+@st.cache_resource(show_spinner=False)
+def cluster_model(k: int = 4) -> tuple[StandardScaler, PCA, MiniBatchKMeans]:
+    # Fit once on the full dataset; filtered views only transform/predict.
+    subset = load_data()[CLUSTER_FEATURES].dropna()
     scaler = StandardScaler()
     scaled = scaler.fit_transform(subset)
-    kmeans = KMeans(n_clusters=k, random_state=42, n_init="auto")
-    labels = kmeans.fit_predict(scaled)
+    kmeans = MiniBatchKMeans(n_clusters=k, batch_size=4096, n_init=3, random_state=42)
+    kmeans.fit(scaled)
+    pca = PCA(n_components=2, svd_solver="randomized", random_state=42)
+    pca.fit(scaled)
+    return scaler, pca, kmeans
+
+
+def compute_clusters(df: pd.DataFrame, k: int = 4) -> pd.DataFrame:
+    scaler, pca, kmeans = cluster_model(k)
+    subset = df[CLUSTER_FEATURES].dropna()
+    if subset.empty:
+        return subset.reindex(
+            columns=[*CLUSTER_FEATURES, "cluster_id", "pca_1", "pca_2", "cluster_name"]
+        )
+    scaled = scaler.transform(subset)
     subset = subset.copy()
-    subset["cluster_id"] = labels
+    subset["cluster_id"] = kmeans.predict(scaled)
 
-    pca = PCA(n_components=2, random_state=42)
-    coords = pca.fit_transform(scaled)
+    coords = pca.transform(scaled)
     subset["pca_1"] = coords[:, 0]
     subset["pca_2"] = coords[:, 1]
 
-    cluster_names = label_clusters(kmeans.cluster_centers_, features)
+    cluster_names = label_clusters(kmeans.cluster_centers_, CLUSTER_FEATURES)
     subset["cluster_name"] = subset["cluster_id"].map(cluster_names)
     return subset
 
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def compute_clusters_cached(filter_key: FilterKey, k: int = 4) -> pd.DataFrame:
+    return compute_clusters(apply_filter_key(filter_key), k=k)
+
+
 def label_clusters(centers: np.ndarray, features: list[str]) -> dict[int, str]:
     labels: dict[int, str] = {}
     feature_idx = {name: idx for idx, name in enumerate(features)}
@@ -106,10 +219,77 @@ def label_clusters(centers: np.ndarray, features: list[str]) -> dict[int, str]:
     return labels
 
 
-def line_trend(df: pd.DataFrame, y_col: str, title: str, y_label: str):
-    data = df.dropna(subset=["year", y_col])
-    grouped = data.groupby("year", as_index=False)[y_col].mean()
-    fig = px.line(grouped, x="year", y=y_col, title=title, markers=True)
+def top_n(values: np.ndarray, n: int, largest: bool = True) -> np.ndarray:
+    if n <= 0:
+        return np.arange(0)
+    if len(values) > n:
+        # Keep every row tied with the n-th best value so ties resolve by position,
+        # matching nlargest/nsmallest(keep="first").
+        if largest:
+            kth = values[np.argpartition(values, -n)[-n]]
+            cand = np.flatnonzero(values >= kth)
+        else:
+            kth = values[np.argpartition(values, n - 1)[n - 1]]
+            cand = np.flatnonzero(values <= kth)
+    else:
+        cand = np.arange(len(values))
+    key = -values[cand] if largest else values[cand]
+    return cand[np.lexsort((cand, key))][:n]
+
+
+def top_n_rows(df: pd.DataFrame, col: str, n: int = 15, largest: bool = True) -> pd.DataFrame:
+    values = df[col].to_numpy(dtype="float64", na_value=np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    return df.iloc[valid[top_n(values[valid], n, largest)]]
+
+
+def downsample_by_group(
+    df: pd.DataFrame, group_col: str, max_points: int = MAX_PLOT_POINTS
+) -> pd.DataFrame:
+    if len(df) <= max_points:
+        return df
+    groups = max(df[group_col].nunique(), 1)
+    per_group = max(max_points // groups, 1)
+    shuffled = df.sample(frac=1.0, random_state=0)
+    rank = shuffled.groupby(group_col, observed=True).cumcount().to_numpy()
+    return shuffled[rank < per_group].sort_index()
+
+
+def box_stats(
+    df: pd.DataFrame, group_col: str, value_col: str
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    if df.empty:
+        columns = [group_col, "q1", "median", "q3", "lowerfence", "upperfence"]
+        return pd.DataFrame(columns=columns), df
+    ordered = df.sort_values([group_col, value_col])
+    sizes = ordered.groupby(group_col, observed=True, sort=True).size()
+    counts = sizes.to_numpy()
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    sorted_values = ordered[value_col].to_numpy(dtype="float64")
+    stats = pd.DataFrame(index=sizes.index)
+    for name, p in (("q1", 0.25), ("median", 0.5), ("q3", 0.75)):
+        # Hazen interpolation (position n*p - 0.5), which Plotly's "linear" quartilemethod uses.
+        pos = np.clip(counts * p - 0.5, 0, counts - 1)
+        lo = np.floor(pos).astype(int)
+        hi = np.minimum(lo + 1, counts - 1)
+        frac = pos - lo
+        lo_val = sorted_values[starts + lo]
+        stats[name] = lo_val + frac * (sorted_values[starts + hi] - lo_val)
+    iqr = stats["q3"] - stats["q1"]
+    low = (stats["q1"] - 1.5 * iqr).reindex(df[group_col]).to_numpy()
+    high = (stats["q3"] + 1.5 * iqr).reindex(df[group_col]).to_numpy()
+    values = df[value_col].to_numpy()
+    inside = (values >= low) & (values <= high)
+    # Whiskers end at the furthest observed points within 1.5 IQR, as Plotly draws them.
+    fences = df.loc[inside].groupby(group_col, observed=True)[value_col].agg(["min", "max"])
+    stats["lowerfence"] = fences["min"]
+    stats["upperfence"] = fences["max"]
+    return stats.reset_index(), df.loc[~inside]
+
+
+def line_trend(yearly: pd.DataFrame, y_col: str, title: str, y_label: str):
+    data = yearly.dropna(subset=["year", y_col])
+    fig = px.line(data, x="year", y=y_col, title=title, markers=True)
     fig.update_layout(yaxis_title=y_label)
     return fig
 
@@ -129,56 +309,62 @@ def _wiki_request(params: dict[str, str]) -> dict:
 def _fetch_wikipedia_image_url(query: str) -> str | None:
     if not query:
         return None
-    direct = _wiki_request(
-        {
-            "action": "query",
-            "format": "json",
-            "prop": "pageimages",
-            "piprop": "original",
-            "titles": query,
-        }
-    )
-    pages = direct.get("query", {}).get("pages", {})
-    if pages:
-        first_page = next(iter(pages.values()), {})
-        image_url = first_page.get("original", {}).get("source")
-        if image_url:
-            return image_url
-    search = _wiki_request(
-        {
-            "action": "query",
-            "format": "json",
-            "list": "search",
-            "srsearch": query,
-            "srlimit": "1",
-        }
-    )
-    results = search.get("query", {}).get("search", [])
-    if not results:
-        return None
-    title = results[0].get("title")
-    if not title:
-        return None
-    page = _wiki_request(
+    # One round trip: search for the best matching page and return its lead image.
+    result = _wiki_request(
         {
             "action": "query",
             "format": "json",
+            "generator": "search",
+            "gsrsearch": query,
+            "gsrlimit": "1",
             "prop": "pageimages",
             "piprop": "original",
-            "titles": title,
         }
     )
-    pages = page.get("query", {}).get("pages", {})
+    pages = result.get("query", {}).get("pages", {})
     if not pages:
         return None
     first_page = next(iter(pages.values()), {})
     return first_page.get("original", {}).get("source")
 
 
-@st.cache_data(show_spinner=False, ttl=86400)
-def get_wikipedia_image_url(queries: tuple[str, ...]) -> str | None:
+def _cached_wikipedia_image_url(query: str) -> str | None:
+    with _WIKI_CACHE_LOCK:
+        try:
+            with shelve.open(str(WIKI_CACHE_PATH)) as cache:
+                entry = cache.get(query)
+        except _WIKI_CACHE_ERRORS:
+            entry = None
+    if isinstance(entry, tuple):
+        fetched_at, url = entry
+        # Found images are kept; misses are re-checked once they are older than the TTL.
+        if url or time.time() - fetched_at < WIKI_MISS_TTL:
+            return url
+
+    # Fetch errors propagate so neither this cache nor st.cache_data stores them.
+    url = _fetch_wikipedia_image_url(query)
+
+    with _WIKI_CACHE_LOCK:
+        try:
+            with shelve.open(str(WIKI_CACHE_PATH)) as cache:
+                cache[query] = (time.time(), url)
+        except _WIKI_CACHE_ERRORS:
+            pass
+    return url
+
+
+@st.cache_data(show_spinner=False, ttl=WIKI_MISS_TTL)
+def _lookup_wikipedia_image_url(queries: tuple[str, ...]) -> str | None:
     for query in queries:
-        url = _fetch_wikipedia_image_url(query)
+        url = _cached_wikipedia_image_url(query)
         if url:
             return url
     return None
+
+
+def get_wikipedia_image_url(queries: tuple[str, ...]) -> str | None:
+    try:
+        return _lookup_wikipedia_image_url(queries)
+    except (OSError, ValueError):
+        # Raised outside the cached function, so the next rerun retries the lookup.
+        return None
@@ -31,6 +31,39 @@ NUMERIC_COLUMNS = [
 ]
 
 
+RAW_DTYPES = {
+    "Make": "category",
+    "Modle": "category",
+    "Trim": "category",
+    "engine_type": "category",
+    "cylinder_layout": "category",
+    "Year_from": "float32",
+    "Year_to": "float32",
+    "engine_hp": "float32",
+    "max_power_kw": "float32",
+    "acceleration_0_100_km/h_s": "float32",
+    "mixed_fuel_consumption_per_100_km_l": "float32",
+    "city_fuel_per_100km_l": "float32",
+    "highway_fuel_per_100km_l": "float32",
+    "CO2_emissions_g/km": "float32",
+    "electric_range_km": "float32",
+    "number_of_cylinders": "float32",
+    "valves_per_cylinder": "float32",
+    "cylinder_bore_mm": "float32",
+}
+
+
+RAW_COLUMNS = set(RAW_DTYPES) | {
+    # Free-text columns that need coerce_numeric or regex parsing.
+    "engine_hp_rpm",
+    "maximum_torque_n_m",
+    "battery_capacity_KW_per_h",
+    "charging_time_h",
+    "cylinder_bore_and_stroke_cycle_mm",
+    "capacity_cm3",
+}
+
+
 OUTLIER_BOUNDS = {
     "engine_hp": (20, 2000),
     "max_power_kw": (10, 1500),
@@ -41,6 +74,12 @@ OUTLIER_BOUNDS = {
 }
 
 
+CATEGORICAL_COLUMNS = ["make", "model", "trim", "engine_type", "cylinder_layout"]
+
+
+BORE_STROKE_PATTERN = r"([0-9]+(?:\.[0-9]+)?)(?:[^0-9.]+([0-9]+(?:\.[0-9]+)?))?"
+
+
 @dataclass
 class SchemaReport:
     rows: int
@@ -49,7 +88,14 @@ class SchemaReport:
 
 
 def load_raw_csv(path: str) -> pd.DataFrame:
-    return pd.read_csv(path, low_memory=False)
+    # The pyarrow engine needs an explicit column list, so resolve it from the header.
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = [col for col in header if col in RAW_COLUMNS]
+    dtypes = {col: dtype for col, dtype in RAW_DTYPES.items() if col in usecols}
+    try:
+        return pd.read_csv(path, engine="pyarrow", usecols=usecols, dtype=dtypes)
+    except ImportError:
+        return pd.read_csv(path, usecols=usecols, dtype=dtypes, low_memory=False)
 
 
 def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -73,14 +119,9 @@ def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
 def coerce_numeric(df: pd.DataFrame, cols: Iterable[str]) -> pd.DataFrame:
     df = df.copy()
     for col in cols:
-        if col not in df.columns:
+        if col not in df.columns or pd.api.types.is_numeric_dtype(df[col]):
             continue
-        cleaned = (
-            df[col]
-            .astype(str)
-            .str.replace(",", "", regex=False)
-            .str.replace(r"[^0-9.\\-]", "", regex=True)
-        )
+        cleaned = df[col].astype(str).str.replace(r"[^0-9.\-]", "", regex=True)
         df[col] = pd.to_numeric(cleaned, errors="coerce")
     return df
 
@@ -88,14 +129,18 @@ def coerce_numeric(df: pd.DataFrame, cols: Iterable[str]) -> pd.DataFrame:
 def parse_bore_stroke(value: str) -> tuple[float | None, float | None]:
     if not isinstance(value, str):
         return None, None
-    numbers = re.findall(r"[0-9]+(?:\\.[0-9]+)?", value)
+    numbers = re.findall(r"[0-9]+(?:[.,][0-9]+)?", value)
     if len(numbers) >= 2:
-        return float(numbers[0]), float(numbers[1])
+        return _to_float(numbers[0]), _to_float(numbers[1])
     if len(numbers) == 1:
-        return float(numbers[0]), None
+        return _to_float(numbers[0]), None
     return None, None
 
 
+def _to_float(number: str) -> float:
+    return float(number.replace(",", "."))
+
+
 def compute_displacement_l(
     bore_mm: float | None, stroke_mm: float | None, cylinders: float | None
 ) -> float | None:
@@ -116,9 +161,14 @@ def add_engine_features(df: pd.DataFrame) -> pd.DataFrame:
     bore = None
     stroke = None
     if "cylinder_bore_and_stroke_cycle_mm" in df.columns:
-        parsed = df["cylinder_bore_and_stroke_cycle_mm"].apply(parse_bore_stroke)
-        bore = parsed.apply(lambda x: x[0])
-        stroke = parsed.apply(lambda x: x[1])
+        parsed = (
+            df["cylinder_bore_and_stroke_cycle_mm"]
+            .astype(str)
+            .str.replace(",", ".", regex=False)
+            .str.extract(BORE_STROKE_PATTERN, expand=True)
+        )
+        bore = pd.to_numeric(parsed[0], errors="coerce")
+        stroke = pd.to_numeric(parsed[1], errors="coerce")
     if "cylinder_bore_mm" in df.columns:
         if bore is None:
             bore = df["cylinder_bore_mm"]
@@ -133,10 +183,18 @@ def add_engine_features(df: pd.DataFrame) -> pd.DataFrame:
     else:
         cylinders = pd.Series([None] * len(df), index=df.index)
 
-    df["displacement_l"] = [
-        compute_displacement_l(b, s, c)
-        for b, s, c in zip(df["bore_mm"], df["stroke_mm"], cylinders)
-    ]
+    bore_arr = pd.to_numeric(df["bore_mm"], errors="coerce").to_numpy(dtype="float64")
+    stroke_arr = pd.to_numeric(df["stroke_mm"], errors="coerce").to_numpy(dtype="float64")
+    cyl_arr = pd.to_numeric(cylinders, errors="coerce").to_numpy(dtype="float64")
+    # One output buffer updated in place; the inputs may be views of df columns.
+    displacement = np.multiply(bore_arr, 0.5)
+    np.square(displacement, out=displacement)
+    displacement *= stroke_arr
+    displacement *= cyl_arr
+    displacement *= np.pi / 1_000_000.0
+    valid = (bore_arr > 0) & (stroke_arr > 0) & (cyl_arr > 0)
+    displacement[~valid] = np.nan
+    df["displacement_l"] = displacement
     if "capacity_cm3" in df.columns:
         capacity_l = pd.to_numeric(df["capacity_cm3"], errors="coerce") / 1000.0
         df["displacement_l"] = df["displacement_l"].fillna(capacity_l)
@@ -146,23 +204,22 @@ def add_engine_features(df: pd.DataFrame) -> pd.DataFrame:
 
     def _text_series(col: str) -> pd.Series:
         if col in df.columns:
-            return df[col].astype(str).str.strip()
-        return pd.Series([""] * len(df), index=df.index)
+            return df[col].astype("string").str.strip()
+        return pd.Series(pd.NA, index=df.index, dtype="string")
 
     displacement_l = pd.to_numeric(df["displacement_l"], errors="coerce")
-
+    parts = [
+        _text_series("engine_type"),
+        _text_series("cylinder_layout"),
+        _text_series("number_of_cylinders"),
+        displacement_l.round(2).astype("string") + "L",
+    ]
     df["engine_signature"] = (
         _text_series("make")
-        + " "
-        + _text_series("engine_type")
-        + " "
-        + _text_series("cylinder_layout")
-        + " "
-        + _text_series("number_of_cylinders")
-        + " "
-        + displacement_l.round(2).astype(str)
-        + "L"
-    ).str.replace("nan", "", regex=False).str.strip()
+        .str.cat(parts, sep=" ", na_rep="")
+        .str.replace(r"\s{2,}", " ", regex=True)
+        .str.strip()
+    )
 
     df["balanced_score"] = compute_balanced_score(df)
     return df
@@ -175,22 +232,30 @@ def compute_balanced_score(df: pd.DataFrame) -> pd.Series:
         "mixed_fuel_consumption_per_100_km_l": -1.0,
         "co2_emissions_g_km": -1.0,
     }
-    zscores = []
-    for col, weight in metrics.items():
-        if col not in df.columns:
-            continue
-        series = df[col]
-        mean = series.mean(skipna=True)
-        std = series.std(skipna=True)
-        if std == 0 or np.isnan(std):
-            z = pd.Series(0.0, index=df.index)
-        else:
-            z = (series - mean) / std
-        zscores.append(z * weight)
-    if not zscores:
+    cols = [col for col in metrics if col in df.columns]
+    if not cols:
         return pd.Series(np.nan, index=df.index)
-    stacked = pd.concat(zscores, axis=1)
-    return stacked.mean(axis=1, skipna=True)
+    values = df[cols].to_numpy(dtype="float64", na_value=np.nan)
+    weights = np.array([metrics[col] for col in cols])
+
+    observed = ~np.isnan(values)
+    counts = observed.sum(axis=0)
+    filled = np.where(observed, values, 0.0)
+    mean = filled.sum(axis=0) / np.maximum(counts, 1)
+    centered = np.where(observed, values - mean, 0.0)
+    var = (centered**2).sum(axis=0) / np.maximum(counts - 1, 1)
+    std = np.sqrt(var)
+    # Constant or near-empty metrics contribute a neutral 0 rather than NaN.
+    degenerate = (counts < 2) | (std == 0)
+    zscores = np.where(degenerate, 0.0, (values - mean) / np.where(degenerate, 1.0, std))
+    zscores *= weights
+
+    present = ~np.isnan(zscores)
+    row_counts = present.sum(axis=1)
+    row_sums = np.where(present, zscores, 0.0).sum(axis=1)
+    score = np.full(len(df), np.nan)
+    np.divide(row_sums, row_counts, out=score, where=row_counts > 0)
+    return pd.Series(score, index=df.index)
 
 
 def clip_outliers(df: pd.DataFrame) -> pd.DataFrame:
@@ -201,6 +266,17 @@ def clip_outliers(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], downcast="float")
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
 def schema_report(df: pd.DataFrame) -> SchemaReport:
     missing = df.isna().sum().sort_values(ascending=False)
     return SchemaReport(rows=df.shape[0], cols=df.shape[1], missing_by_col=missing)
@@ -212,4 +288,5 @@ def clean_engine_data(path: str) -> pd.DataFrame:
     df = coerce_numeric(df, NUMERIC_COLUMNS)
     df = clip_outliers(df)
     df = add_engine_features(df)
+    df = optimize_dtypes(df)
     return df
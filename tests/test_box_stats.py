@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from utils import box_stats
+
+
+def test_box_stats_keeps_exact_quartiles_and_outliers():
+    df = pd.DataFrame(
+        {
+            "make": ["A"] * 6 + ["B"] * 4,
+            "hp": [100.0, 110.0, 120.0, 130.0, 140.0, 900.0, 50.0, 60.0, 70.0, 80.0],
+        }
+    )
+
+    stats, outliers = box_stats(df, "make", "hp")
+
+    a = stats.set_index("make").loc["A"]
+    # Plotly's "linear" quartiles sit at position n*p - 0.5 (Hazen), not (n-1)*p.
+    assert [a["q1"], a["median"], a["q3"]] == [110.0, 125.0, 140.0]
+    assert a["lowerfence"] == 100.0
+    assert a["upperfence"] == 140.0
+    assert outliers["hp"].tolist() == [900.0]
+    assert stats.set_index("make").loc["B", "upperfence"] == 80.0
+
+
+def test_box_stats_empty_frame():
+    df = pd.DataFrame({"make": pd.Series([], dtype="category"), "hp": []})
+
+    stats, outliers = box_stats(df, "make", "hp")
+
+    assert stats.empty
+    assert list(stats.columns) == ["make", "q1", "median", "q3", "lowerfence", "upperfence"]
+    assert outliers.empty
+
+
+def test_box_stats_matches_hazen_quantiles():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "make": pd.Categorical(rng.choice(["A", "B", "C"], size=300)),
+            "hp": rng.normal(200, 50, size=300).round(),
+        }
+    )
+
+    stats, _ = box_stats(df, "make", "hp")
+
+    for row in stats.itertuples():
+        values = df.loc[df["make"] == row.make, "hp"]
+        expected = np.quantile(values, [0.25, 0.5, 0.75], method="hazen")
+        assert np.allclose([row.q1, row.median, row.q3], expected)
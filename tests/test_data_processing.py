@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from engine_atlas.data_processing import (
+    add_engine_features,
+    compute_displacement_l,
+    parse_bore_stroke,
+)
+
+
+def _none_if_nan(value):
+    return None if value is None or math.isnan(value) else value
+
+
+def test_vectorized_displacement_matches_scalar():
+    df = pd.DataFrame(
+        {
+            "cylinder_bore_and_stroke_cycle_mm": [
+                "83x73",
+                "83,0x88,0",
+                "83x0",
+                None,
+                None,
+                "90x90",
+                "90x90",
+                "90x90",
+            ],
+            "cylinder_bore_mm": [np.nan, np.nan, np.nan, -83.0, 86.0, np.nan, np.nan, np.nan],
+            "number_of_cylinders": [4.0, 6.0, 4.0, 4.0, 4.0, np.nan, 0.0, -4.0],
+            "capacity_cm3": ["1580", None, "1900", None, "1998", None, None, "2500"],
+        }
+    )
+
+    result = add_engine_features(df)
+
+    for row in result.itertuples():
+        scalar = compute_displacement_l(
+            _none_if_nan(row.bore_mm),
+            _none_if_nan(row.stroke_mm),
+            _none_if_nan(row.number_of_cylinders),
+        )
+        if scalar is None:
+            scalar = pd.to_numeric(row.capacity_cm3, errors="coerce") / 1000.0
+        assert np.isclose(row.displacement_l, scalar, equal_nan=True), row
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("83,0x73,0", (83.0, 73.0)),
+        ("83x73.5", (83.0, 73.5)),
+        ("81", (81.0, None)),
+        ("", (None, None)),
+        (None, (None, None)),
+    ],
+)
+def test_parse_bore_stroke_matches_vectorized_extract(raw, expected):
+    assert parse_bore_stroke(raw) == expected
+
+    result = add_engine_features(pd.DataFrame({"cylinder_bore_and_stroke_cycle_mm": [raw]}))
+    vectorized = (
+        _none_if_nan(result["bore_mm"].iloc[0]),
+        _none_if_nan(result["stroke_mm"].iloc[0]),
+    )
+    assert vectorized == expected
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import top_n_rows
+
+
+@pytest.mark.parametrize("largest", [True, False])
+@pytest.mark.parametrize("n", [1, 3, 5, 15])
+def test_top_n_rows_matches_pandas_with_ties(largest, n):
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 6, size=200).astype("float64")
+    values[rng.choice(200, size=20, replace=False)] = np.nan
+    df = pd.DataFrame({"value": values}, index=np.arange(1000, 1200))
+
+    result = top_n_rows(df, "value", n=n, largest=largest)
+
+    valid = df.dropna(subset=["value"])
+    expected = valid.nlargest(n, "value") if largest else valid.nsmallest(n, "value")
+    assert result.index.tolist() == expected.index.tolist()
+
+
+def test_top_n_rows_fewer_rows_than_n():
+    df = pd.DataFrame({"value": [2.0, np.nan, 5.0, 2.0]})
+    assert top_n_rows(df, "value", n=15).index.tolist() == [2, 0, 3]
@@ -0,0 +1,39 @@
+import utils
+
+
+def _fake_response(url):
+    return {"query": {"pages": {"1": {"original": {"source": url}}}}}
+
+
+class _CorruptShelf:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def get(self, key):
+        raise EOFError("Ran out of input")
+
+    def __setitem__(self, key, value):
+        raise EOFError("Ran out of input")
+
+
+def _corrupt_shelf(path):
+    return _CorruptShelf()
+
+
+def test_unusable_cache_falls_back_to_fetch(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, "WIKI_CACHE_PATH", tmp_path / "missing" / ".wiki_cache")
+    monkeypatch.setattr(utils, "_wiki_request", lambda params: _fake_response("http://img"))
+
+    assert utils._cached_wikipedia_image_url("BMW M3 car") == "http://img"
+
+
+def test_corrupt_cache_entry_is_refetched(tmp_path, monkeypatch):
+    path = tmp_path / ".wiki_cache"
+    monkeypatch.setattr(utils, "WIKI_CACHE_PATH", path)
+    monkeypatch.setattr(utils.shelve, "open", _corrupt_shelf)
+    monkeypatch.setattr(utils, "_wiki_request", lambda params: _fake_response("http://img"))
+
+    assert utils._cached_wikipedia_image_url("BMW M3 car") == "http://img"